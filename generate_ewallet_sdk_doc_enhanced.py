@@ -8,9 +8,20 @@ playwright install chromium
 """
 
 import os
+import sys
+import asyncio
+import logging
+import logging.handlers
 import base64
 import requests
+from requests.adapters import HTTPAdapter
 import hashlib
+import tempfile
+import functools
+import struct
+from concurrent.futures import ThreadPoolExecutor
+import itertools
+from binascii import b2a_base64
 from io import BytesIO
 from datetime import datetime
 from reportlab.lib.pagesizes import letter, A4
@@ -21,41 +32,205 @@ from reportlab.lib.colors import HexColor, black, white
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, PageBreak, Table, TableStyle
 from reportlab.platypus import KeepTogether, ListFlowable, ListItem
 from reportlab.lib import colors
+from reportlab import rl_config
+from reportlab.lib.utils import ImageReader
 from PIL import Image as PILImage
 
-# Try to import playwright for better diagram rendering
-try:
-    from playwright.sync_api import sync_playwright
-    PLAYWRIGHT_AVAILABLE = True
-except ImportError:
-    PLAYWRIGHT_AVAILABLE = False
-    print("⚠️  Playwright not available. Using online mermaid.ink service.")
-    print("   For better quality diagrams, install: pip install playwright")
-    print("   Then run: playwright install chromium\n")
+# Skip reportlab's per-attribute shape validation; it is only useful when debugging
+rl_config.shapeChecking = 0
+
+# Built once per process; the generator adds its custom styles to it on first use
+_STYLES = getSampleStyleSheet()
+
+@functools.lru_cache(maxsize=None)
+def _parse_markup(text, style):
+    """Parse a paragraph's inline markup once per (text, style)"""
+    para = Paragraph(text, style)
+    return para.text, para.style, para.frags, para.bulletText
+
+def _para(text, style):
+    """Return a new Paragraph for text, reusing its parsed markup"""
+    # Flowables keep layout state between builds, so only the parse is shared
+    text, style, frags, bullet_text = _parse_markup(text, style)
+    return Paragraph(text, style, bulletText=bullet_text, frags=frags)
+
+# playwright.async_api once imported, or False if it is not installed. Importing
+# it is deferred until a browser is actually needed.
+_playwright_api = None
+
+def _playwright():
+    """Import Playwright on first use for better diagram rendering"""
+    global _playwright_api
+    if _playwright_api is None:
+        try:
+            import playwright.async_api as api
+            _playwright_api = api
+        except ImportError:
+            _playwright_api = False
+            _LOG.warning("⚠️  Playwright not available. Using online mermaid.ink service.")
+            _LOG.warning("   For better quality diagrams, install: pip install playwright")
+            _LOG.warning("   Then run: playwright install chromium\n")
+    return _playwright_api or None
+
+class _StatusBuffer(logging.handlers.MemoryHandler):
+    """MemoryHandler that hands all buffered records to its stream in one write"""
+    
+    def flush(self):
+        with self.lock:
+            if self.target is None or not self.buffer:
+                return
+            target = self.target
+            target.stream.write("".join(
+                target.format(record) + target.terminator for record in self.buffer
+            ))
+            target.flush()
+            self.buffer.clear()
+
+# Status output is buffered and written out once generation finishes, so slow
+# console I/O does not hold up rendering
+_LOG = logging.getLogger("ewallet_doc")
+_LOG.setLevel(logging.INFO)
+_LOG.propagate = False
+_LOG_BUFFER = _StatusBuffer(
+    1024, flushLevel=logging.CRITICAL, target=logging.StreamHandler(sys.stdout)
+)
+_LOG.addHandler(_LOG_BUFFER)
+
+# Bump together with the CDN URL so cached diagrams are re-rendered
+MERMAID_VERSION = "10"
+MERMAID_CDN_URL = f"https://cdn.jsdelivr.net/npm/mermaid@{MERMAID_VERSION}/dist/mermaid.min.js"
+DIAGRAM_VIEWPORT = {'width': 1920, 'height': 1080}
+
+# Cached diagrams are keyed by renderer as well as source, since the renderers
+# differ in output and file format (mermaid.ink serves JPEG by default)
+PLAYWRIGHT_RENDERER = f"playwright/mermaid@{MERMAID_VERSION}"
+MERMAID_INK_RENDERER = "mermaid.ink"
+_CACHE_FORMATS = {PLAYWRIGHT_RENDERER: 'png', MERMAID_INK_RENDERER: 'jpg'}
+
+# Largest diagram that fits the page's frame: the page less its margins and
+# the frame's 6pt padding on each side (456 x 636 on letter)
+PAGE_MARGIN = 72
+FRAME_PADDING = 6
+MAX_DIAGRAM_WIDTH = letter[0] - 2*(PAGE_MARGIN + FRAME_PADDING)
+MAX_DIAGRAM_HEIGHT = letter[1] - 2*(PAGE_MARGIN + FRAME_PADDING)
+
+# Standard base64 -> URL-safe alphabet, for mermaid.ink URLs
+_URL_SAFE = bytes.maketrans(b'+/', b'-_')
+
+# Diagram page, split around the Mermaid <script> tag. The diagram source is
+# passed to mermaid.render() directly, so the page is the same for every diagram.
+_HTML_HEAD = """<!DOCTYPE html>
+<html>
+<head>
+"""
+_HTML_TAIL = """
+<style>
+    body {
+        background: white;
+        display: flex;
+        justify-content: center;
+        align-items: center;
+        margin: 40px;
+    }
+    #diagram {
+        background: white;
+    }
+</style>
+</head>
+<body>
+<div id="diagram"></div>
+<script>
+    mermaid.initialize({
+        startOnLoad: false,
+        theme: 'default',
+        themeVariables: {
+            fontSize: '16px'
+        }
+    });
+</script>
+</body>
+</html>
+"""
+
+# Escapes for embedding raw source text in reportlab paragraph markup
+_ESCAPE = str.maketrans({'<': '&lt;', '>': '&gt;', '&': '&amp;'})
+
+# Slimmed-down Chromium for offline rendering. --no-sandbox is acceptable
+# because the only content loaded is our own diagram source.
+CHROMIUM_ARGS = [
+    '--no-sandbox',
+    '--disable-gpu',
+    '--disable-dev-shm-usage',
+    '--disable-extensions',
+    '--disable-background-timer-throttling',
+    '--disable-renderer-backgrounding',
+    '--disable-backgrounding-occluded-windows',
+]
+
+async def _allow_only_mermaid(route):
+    """Playwright route handler: fetch the Mermaid bundle, abort everything else"""
+    if route.request.url == MERMAID_CDN_URL:
+        await route.continue_()
+    else:
+        await route.abort()
+
+def _image_size(path):
+    """Read (width, height) of a complete PNG or JPEG file, or None if it can't be read"""
+    try:
+        with open(path, 'rb') as f:
+            header = f.read(24)
+            f.seek(-8, os.SEEK_END)
+            trailer = f.read()
+    except OSError:
+        return None
+    # Images are only decoded in doc.build(), so a file cut short by an
+    # interrupted write must be caught here: check for the end-of-image marker
+    if header[:8] == b'\x89PNG\r\n\x1a\n':
+        # The size is in the IHDR chunk, so cache hits skip opening the file with PIL
+        if trailer != b'IEND\xaeB`\x82':
+            return None
+        return struct.unpack('>II', header[16:24])
+    if not trailer.endswith(b'\xff\xd9'):
+        return None
+    try:
+        return ImageReader(path).getSize()
+    except Exception:
+        return None
+
+def _write_atomic(path, data):
+    """Write data to path through a temp file, so readers never see a partial file"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
 
 class EnhancedEWalletSDKDocGenerator:
     """Enhanced PDF generator with local Mermaid rendering support"""
     
     def __init__(self, output_filename="EWallet_Flutter_SDK_Architecture.pdf", use_playwright=True):
         self.output_filename = output_filename
-        self.use_playwright = use_playwright and PLAYWRIGHT_AVAILABLE
-        self.doc = SimpleDocTemplate(
-            output_filename,
-            pagesize=letter,
-            rightMargin=72,
-            leftMargin=72,
-            topMargin=72,
-            bottomMargin=72
-        )
+        self.use_playwright = use_playwright  # Checked against the install on first render
+        self.doc = None  # Created per build, just before doc.build()
         self.story = []
-        self.styles = getSampleStyleSheet()
-        self.temp_files = []  # Track temp files for cleanup
+        self.styles = _STYLES
+        self.temp_files = set()  # Track temp files for cleanup
+        self.cache_dir = ".mermaid_cache"  # Rendered diagrams, keyed by content
+        self._pw = None  # Playwright driver, started on first render
+        self._browser = None  # Shared Chromium instance
+        self._rendered = {}  # diagram_name -> render task from prerender_all_diagrams
+        self._mem_cache = {}  # diagram source -> render result, for repeats within a run
+        self._page_html = None  # Diagram page with the Mermaid bundle, built once
+        # Shared keep-alive session, so concurrent downloads reuse connections
+        self._http = requests.Session()
+        self._http.mount('https://', HTTPAdapter(pool_connections=8, pool_maxsize=8))
         self._setup_custom_styles()
-        
-        if self.use_playwright:
-            print("✅ Using Playwright for high-quality diagram rendering")
-        else:
-            print("📡 Using mermaid.ink API for diagram rendering")
     
     def _setup_custom_styles(self):
         """Setup custom paragraph styles"""
@@ -120,139 +295,324 @@ class EnhancedEWalletSDKDocGenerator:
                 spaceAfter=12,
                 leading=14
             ))
+        
+        # Cache the styles used on every paragraph
+        self._body = self.styles['CustomBody']
+        self._code = self.styles['CodeBlock']
+        self._normal = self.styles['Normal']
+    
+    @staticmethod
+    def _remove_temp_file(temp_file):
+        """Delete one temporary file, ignoring files that are already gone"""
+        try:
+            os.unlink(temp_file)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            _LOG.warning(f"Warning: Could not delete {temp_file}: {e}")
     
     def cleanup_temp_files(self):
         """Clean up all temporary image files"""
-        for temp_file in self.temp_files:
+        # Unlinks are blocking syscalls, so overlap them across threads
+        if self.temp_files:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                list(executor.map(self._remove_temp_file, self.temp_files))
+        self.temp_files = set()
+    
+    def _load_mermaid_js(self):
+        """Return the Mermaid bundle, downloading it into the cache on first use"""
+        js_path = os.path.join(self.cache_dir, f"mermaid@{MERMAID_VERSION}.min.js")
+        try:
+            with open(js_path, encoding='utf-8') as f:
+                mermaid_js = f.read()
+        except (OSError, UnicodeDecodeError):
+            # Missing or unreadable: fetch a fresh copy
             try:
-                if os.path.exists(temp_file):
-                    os.remove(temp_file)
+                response = self._http.get(MERMAID_CDN_URL, timeout=30)
+                response.raise_for_status()
+                mermaid_js = response.content.decode('utf-8')
+                os.makedirs(self.cache_dir, exist_ok=True)
+                _write_atomic(js_path, response.content)
             except Exception as e:
-                print(f"Warning: Could not delete {temp_file}: {e}")
-        self.temp_files = []
+                _LOG.warning(f"⚠️  Could not cache Mermaid bundle, pages will load it from the CDN: {e}")
+                return None
+        
+        # Keep the bundle from closing the inline <script> tag early
+        return mermaid_js.replace('</script', '<\\/script')
+    
+    def _build_page_html(self):
+        """Assemble the diagram page around the Mermaid bundle"""
+        mermaid_js = self._load_mermaid_js()
+        if mermaid_js:
+            mermaid_script = f"<script>{mermaid_js}</script>"
+        else:
+            mermaid_script = f'<script src="{MERMAID_CDN_URL}"></script>'
+        return _HTML_HEAD + mermaid_script + _HTML_TAIL
+    
+    async def _get_browser(self):
+        """Launch Chromium on first use and reuse it for every diagram"""
+        if self._browser is None:
+            api = _playwright()
+            if api is None:
+                raise RuntimeError("Playwright is not installed")
+            if self._pw is None:
+                self._pw = await api.async_playwright().start()
+            self._browser = await self._pw.chromium.launch(headless=True, args=CHROMIUM_ARGS)
+        # Only once the launch has worked, so a missing browser binary fails
+        # fast instead of first waiting on the bundle download
+        if self._page_html is None:
+            self._page_html = await asyncio.to_thread(self._build_page_html)
+        return self._browser
     
-    def render_mermaid_with_playwright(self, mermaid_code, diagram_name):
+    async def _shutdown_browser(self):
+        """Close the shared browser and stop the Playwright driver"""
+        try:
+            if self._browser is not None:
+                await self._browser.close()
+            if self._pw is not None:
+                await self._pw.stop()
+        except Exception as e:
+            _LOG.warning(f"Warning: Could not shut down browser: {e}")
+        finally:
+            self._browser = None
+            self._pw = None
+    
+    async def render_mermaid_with_playwright(self, mermaid_code, diagram_name):
         """Render Mermaid diagram using Playwright (higher quality)"""
+        context = None
         try:
-            with sync_playwright() as p:
-                browser = p.chromium.launch()
-                page = browser.new_page(viewport={'width': 1920, 'height': 1080})
-                
-                # Create HTML with Mermaid
-                html_content = f"""
-                <!DOCTYPE html>
-                <html>
-                <head>
-                    <script src="https://cdn.jsdelivr.net/npm/mermaid@10/dist/mermaid.min.js"></script>
-                    <style>
-                        body {{ 
-                            background: white; 
-                            display: flex; 
-                            justify-content: center; 
-                            align-items: center;
-                            margin: 40px;
-                        }}
-                        #diagram {{ 
-                            background: white;
-                        }}
-                    </style>
-                </head>
-                <body>
-                    <div id="diagram" class="mermaid">
-{mermaid_code}
-                    </div>
-                    <script>
-                        mermaid.initialize({{ 
-                            startOnLoad: true,
-                            theme: 'default',
-                            themeVariables: {{
-                                fontSize: '16px'
-                            }}
-                        }});
-                    </script>
-                </body>
-                </html>
-                """
-                
-                page.set_content(html_content)
-                page.wait_for_timeout(2000)  # Wait for rendering
-                
-                # Take screenshot
-                img_path = f"temp_{diagram_name}.png"
-                diagram_element = page.locator('#diagram')
-                diagram_element.screenshot(path=img_path)
-                
-                browser.close()
-                return img_path
-                
+            # A context per diagram keeps concurrent renders isolated
+            browser = await self._get_browser()
+            context = await browser.new_context(viewport=DIAGRAM_VIEWPORT)
+            page = await context.new_page()
+            await page.route("**/*", _allow_only_mermaid)
+            
+            await page.set_content(self._page_html)
+            
+            # mermaid.render() resolves once the SVG is built, so there is
+            # no need for a fixed wait before taking the screenshot
+            await page.evaluate(
+                """async (code) => {
+                    const { svg } = await mermaid.render('rendered-diagram', code);
+                    document.querySelector('#diagram').innerHTML = svg;
+                }""",
+                mermaid_code
+            )
+            await page.wait_for_function(
+                "!!document.querySelector('#diagram svg') && "
+                "document.querySelector('#diagram svg').getBBox().width > 0",
+                timeout=10000
+            )
+            
+            # Take screenshot straight from CDP, clipped to the diagram, and
+            # keep the PNG in memory rather than going through a temp file
+            bbox = await page.locator('#diagram').bounding_box()
+            cdp = await context.new_cdp_session(page)
+            data = (await cdp.send('Page.captureScreenshot', {
+                'format': 'png',
+                'optimizeForSpeed': True,
+                'captureBeyondViewport': True,
+                'clip': {**bbox, 'scale': 1},
+            }))['data']
+            await cdp.detach()
+            return base64.b64decode(data), bbox['width'], bbox['height']
+            
         except Exception as e:
-            print(f"  Playwright rendering failed: {str(e)}")
+            _LOG.warning(f"  Playwright rendering failed: {str(e)}")
             return None
+        finally:
+            # Only the context is per-diagram; the browser stays up for the rest
+            if context is not None:
+                await context.close()
     
     def render_mermaid_online(self, mermaid_code, diagram_name):
         """Render Mermaid diagram using mermaid.ink API"""
         try:
-            encoded = base64.urlsafe_b64encode(mermaid_code.encode('utf-8')).decode('utf-8')
+            encoded = b2a_base64(mermaid_code.encode('utf-8'), newline=False).translate(_URL_SAFE).decode('ascii')
             url = f"https://mermaid.ink/img/{encoded}"
             
-            response = requests.get(url, timeout=30)
+            response = self._http.get(url, timeout=30)
             
             if response.status_code == 200:
-                img_path = f"temp_{diagram_name}.png"
+                img_path = f"temp_{diagram_name}.jpg"
                 with open(img_path, 'wb') as f:
                     f.write(response.content)
                 return img_path
             else:
-                print(f"  Online rendering failed: Status {response.status_code}")
+                _LOG.warning(f"  Online rendering failed: Status {response.status_code}")
                 return None
                 
         except Exception as e:
-            print(f"  Online rendering error: {str(e)}")
+            _LOG.warning(f"  Online rendering error: {str(e)}")
+            return None
+    
+    def _cache_key(self, mermaid_code, renderer):
+        """Return the content hash identifying a diagram's source and renderer"""
+        return hashlib.sha256(f"{renderer}\0{mermaid_code}".encode('utf-8')).hexdigest()
+    
+    def _cache_path(self, mermaid_code, renderer):
+        """Return the cache location for a diagram rendered by renderer"""
+        key = self._cache_key(mermaid_code, renderer)
+        return os.path.join(self.cache_dir, f"{key}.{_CACHE_FORMATS[renderer]}")
+    
+    def _load_from_cache(self, mermaid_code, renderer):
+        """Return (path, width, height) of a cached render, or None"""
+        cache_path = self._cache_path(mermaid_code, renderer)
+        if not os.path.exists(cache_path):
+            return None
+        size = _image_size(cache_path)
+        if not size:
+            # Truncated or corrupt: drop it so the diagram is rendered again
+            _LOG.warning(f"  Warning: Discarding unreadable cache entry {cache_path}")
+            self._remove_temp_file(cache_path)
+            return None
+        _LOG.info("  ♻️  Loaded from cache")
+        return (cache_path, *size)
+    
+    def _write_to_cache(self, mermaid_code, diagram_name, png_bytes):
+        """Save an in-memory Playwright render to the cache for later runs"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            _write_atomic(self._cache_path(mermaid_code, PLAYWRIGHT_RENDERER), png_bytes)
+        except OSError as e:
+            _LOG.warning(f"  Warning: Could not cache {diagram_name}: {e}")
+    
+    def _store_in_cache(self, mermaid_code, diagram_name, img_path):
+        """Move a fresh mermaid.ink render into the cache and return its new path"""
+        # Cached files are kept across runs, so they are not tracked in temp_files
+        cache_path = self._cache_path(mermaid_code, MERMAID_INK_RENDERER)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            os.replace(img_path, cache_path)
+            return cache_path
+        except OSError as e:
+            _LOG.warning(f"  Warning: Could not cache {diagram_name}: {e}")
+            self.temp_files.add(img_path)
+            return img_path
+    
+    async def render_mermaid_diagram(self, mermaid_code, diagram_name):
+        """Render Mermaid diagram using best available method
+        
+        Returns (image, width, height), or None if rendering failed. image is
+        PNG bytes for a fresh Playwright render, otherwise a path (cache hit or
+        mermaid.ink).
+        """
+        if mermaid_code in self._mem_cache:
+            _LOG.info("  ♻️  Reused from earlier in this run")
+            return self._mem_cache[mermaid_code]
+        
+        rendered = await self._render_uncached(mermaid_code, diagram_name)
+        if rendered:
+            self._mem_cache[mermaid_code] = rendered
+        return rendered
+    
+    async def _render_uncached(self, mermaid_code, diagram_name):
+        """Load a diagram from the disk cache or render it"""
+        # A Playwright render is preferred whenever one exists, even if the
+        # browser is unavailable this run
+        cached = self._load_from_cache(mermaid_code, PLAYWRIGHT_RENDERER)
+        if cached:
+            return cached
+        
+        if self.use_playwright:
+            rendered = await self.render_mermaid_with_playwright(mermaid_code, diagram_name)
+            if rendered:
+                self._write_to_cache(mermaid_code, diagram_name, rendered[0])
+                return rendered
+            _LOG.info("  Falling back to online rendering...")
+        
+        # Only reached without a Playwright render, so an earlier fallback
+        # never shadows the browser's output
+        cached = self._load_from_cache(mermaid_code, MERMAID_INK_RENDERER)
+        if cached:
+            return cached
+        
+        img_path = await asyncio.to_thread(self.render_mermaid_online, mermaid_code, diagram_name)
+        if not img_path:
+            return None
+        
+        img_path = self._store_in_cache(mermaid_code, diagram_name, img_path)
+        size = _image_size(img_path)
+        if not size:
+            _LOG.warning(f"  Online rendering returned an unreadable image")
+            self._remove_temp_file(img_path)
             return None
+        return (img_path, *size)
     
-    def render_mermaid_diagram(self, mermaid_code, diagram_name):
-        """Render Mermaid diagram using best available method"""
+    async def _arender(self, mermaid_code, diagram_name, limit):
+        """Render one diagram once a slot in the browser is free"""
+        async with limit:
+            return await self.render_mermaid_diagram(mermaid_code, diagram_name)
+    
+    async def prerender_all_diagrams(self, diagrams, max_workers=4):
+        """Start rendering (mermaid_code, diagram_name) pairs in the background"""
         if self.use_playwright:
-            img_path = self.render_mermaid_with_playwright(mermaid_code, diagram_name)
-            if img_path:
-                return img_path
-            print("  Falling back to online rendering...")
+            try:
+                await self._get_browser()
+            except Exception as e:
+                _LOG.warning(f"⚠️  Could not launch Chromium, using mermaid.ink instead: {e}")
+                self.use_playwright = False
+        
+        # Reported only now that the launch has succeeded or failed
+        if self.use_playwright:
+            _LOG.info("✅ Using Playwright for high-quality diagram rendering")
+        else:
+            _LOG.info("📡 Using mermaid.ink API for diagram rendering")
         
-        return self.render_mermaid_online(mermaid_code, diagram_name)
+        # mermaid.ink requests run on worker threads via asyncio.to_thread, so
+        # the same limit caps concurrent downloads and browser renders
+        _LOG.info(f"\n🎨 Rendering {len(diagrams)} diagrams in the background...")
+        limit = asyncio.Semaphore(max_workers)
+        tasks = {}  # Identical diagrams share one render
+        for mermaid_code, diagram_name in diagrams:
+            if mermaid_code not in tasks:
+                tasks[mermaid_code] = asyncio.create_task(
+                    self._arender(mermaid_code, diagram_name, limit)
+                )
+            self._rendered[diagram_name] = tasks[mermaid_code]
+        # Let the tasks reach their first wait (browser IPC, download thread)
+        # before the caller goes back to synchronous story building
+        await asyncio.sleep(0)
+    
+    async def _step(self, message):
+        """Log a build step and yield, so background renders progress between sections"""
+        _LOG.info(message)
+        await asyncio.sleep(0)
     
     def add_title_page(self):
         """Add title page"""
         self.story.append(Spacer(1, 2*inch))
         
-        title = Paragraph("Cross-Platform Hybrid SDK Architecture", self.styles['CustomTitle'])
+        title = _para("Cross-Platform Hybrid SDK Architecture", self.styles['CustomTitle'])
         self.story.append(title)
         self.story.append(Spacer(1, 0.3*inch))
         
-        subtitle = Paragraph("Flutter-Angular eWallet Integration", self.styles['Heading2'])
+        subtitle = _para("Flutter-Angular eWallet Integration", self.styles['Heading2'])
         self.story.append(subtitle)
         self.story.append(Spacer(1, 0.5*inch))
         
-        subtitle2 = Paragraph("Multi-Platform WebView Bridge SDK Pattern", self.styles['Heading3'])
+        subtitle2 = _para("Multi-Platform WebView Bridge SDK Pattern", self.styles['Heading3'])
         self.story.append(subtitle2)
         self.story.append(Spacer(1, 1*inch))
         
-        overview = Paragraph(
+        overview = _para(
             "A comprehensive guide to building a unified SDK that embeds Angular applications "
             "within Flutter apps across Android, iOS, Web, Windows, macOS, and Linux platforms "
             "using platform-specific WebView implementations and JavaScript-to-Native bridges.",
-            self.styles['CustomBody']
+            self._body
         )
         self.story.append(overview)
         self.story.append(Spacer(1, 0.5*inch))
         
+        # Changes every run, so it is not worth caching
         date_text = Paragraph(
             f"<b>Generated:</b> {datetime.now().strftime('%B %d, %Y at %I:%M %p')}",
-            self.styles['Normal']
+            self._normal
         )
         self.story.append(date_text)
         self.story.append(Spacer(1, 0.2*inch))
         
-        version = Paragraph("<b>Version:</b> 1.0.0", self.styles['Normal'])
+        version = _para("<b>Version:</b> 1.0.0", self._normal)
         self.story.append(version)
         
         self.story.append(PageBreak())
@@ -260,95 +620,101 @@ class EnhancedEWalletSDKDocGenerator:
     def add_section(self, title, content, level=2):
         """Add a section"""
         style_name = f'CustomHeading{level}' if f'CustomHeading{level}' in self.styles else 'Heading2'
-        heading = Paragraph(title, self.styles[style_name])
+        heading = _para(title, self.styles[style_name])
         self.story.append(heading)
         self.story.append(Spacer(1, 0.15*inch))
         
         if isinstance(content, list):
             for paragraph in content:
-                p = Paragraph(paragraph, self.styles['CustomBody'])
+                p = _para(paragraph, self._body)
                 self.story.append(p)
                 self.story.append(Spacer(1, 0.1*inch))
         else:
-            p = Paragraph(content, self.styles['CustomBody'])
+            p = _para(content, self._body)
             self.story.append(p)
         
         self.story.append(Spacer(1, 0.2*inch))
     
-    def add_diagram(self, mermaid_code, caption, diagram_name):
+    async def add_diagram(self, mermaid_code, caption, diagram_name):
         """Add diagram to PDF"""
-        print(f"  Rendering: {caption}...")
+        _LOG.info(f"  Rendering: {caption}...")
         
-        img_path = self.render_mermaid_diagram(mermaid_code, diagram_name)
+        # Only wait on the background render once the image is actually needed
+        task = self._rendered.get(diagram_name)
+        if task is not None:
+            rendered = await task
+        else:
+            rendered = await self.render_mermaid_diagram(mermaid_code, diagram_name)
         
-        if img_path and os.path.exists(img_path):
+        image, width, height = rendered or (None, None, None)
+        if isinstance(image, bytes):
+            img_source = BytesIO(image)
+        elif image and os.path.exists(image):
+            img_source = image
+        else:
+            img_source = None
+        
+        if img_source is not None:
             try:
-                caption_para = Paragraph(f"<b>Figure: {caption}</b>", self.styles['CustomBody'])
+                caption_para = _para(f"<b>Figure: {caption}</b>", self._body)
                 self.story.append(caption_para)
                 self.story.append(Spacer(1, 0.1*inch))
                 
-                img = Image(img_path, width=6.5*inch, height=None, kind='proportional')
+                # Fill the frame's width, unless that makes a tall diagram overflow its height
+                scale = min(MAX_DIAGRAM_WIDTH / width, MAX_DIAGRAM_HEIGHT / height)
+                img = Image(img_source, width=width * scale, height=height * scale)
                 self.story.append(img)
                 self.story.append(Spacer(1, 0.2*inch))
-                
-                # Add to cleanup list instead of deleting immediately
-                self.temp_files.append(img_path)
-                print(f"  ✅ Added successfully")
+                _LOG.info(f"  ✅ Added successfully")
                 
             except Exception as e:
-                print(f"  ❌ Error: {str(e)}")
+                _LOG.warning(f"  ❌ Error: {str(e)}")
         else:
-            placeholder = Paragraph(
+            placeholder = _para(
                 f"<i>[Diagram: {caption} - Rendering failed]</i>",
-                self.styles['Normal']
+                self._normal
             )
             self.story.append(placeholder)
             self.story.append(Spacer(1, 0.2*inch))
-            print(f"  ⚠️  Skipped (rendering failed)")
+            _LOG.warning(f"  ⚠️  Skipped (rendering failed)")
     
     def add_code_block(self, code, language="dart"):
         """Add code block"""
         lines = code.split('\n')
-        formatted_lines = [line.replace('<', '&lt;').replace('>', '&gt;') for line in lines[:30]]
-        
+        head = list(itertools.islice((line.translate(_ESCAPE) for line in lines), 30))
         if len(lines) > 30:
-            formatted_lines.append("... (truncated)")
+            head.append("... (truncated)")
         
-        code_text = '<br/>'.join(formatted_lines)
-        code_para = Paragraph(f'<font name="Courier" size="8">{code_text}</font>', self.styles['CodeBlock'])
+        code_text = '<br/>'.join(head)
+        code_para = _para(f'<font name="Courier" size="8">{code_text}</font>', self._code)
         self.story.append(code_para)
         self.story.append(Spacer(1, 0.15*inch))
     
     def generate_full_documentation(self):
         """Generate complete documentation"""
-        print("\n📄 Generating PDF Documentation...")
-        print("="*60)
-        
-        # Title Page
-        print("\n[1/12] Adding title page...")
-        self.add_title_page()
-        
-        # Architecture Overview
-        print("[2/12] Adding architecture overview...")
-        self.add_section(
-            "1. Architecture Overview",
-            [
-                "This architecture pattern is called the <b>Cross-Platform Hybrid SDK Architecture with "
-                "Platform-Specific Abstraction Layer</b> or <b>Multi-Platform WebView Bridge SDK Pattern</b>.",
-                
-                "It combines WebView embedding, JavaScript-to-Native bridges, and platform-specific "
-                "implementations under a unified Dart API interface. The SDK functions as a Flutter Plugin "
-                "Package that provides a single API interface while using different platform-specific "
-                "implementations underneath.",
-                
-                "Your eWallet SDK will embed your Angular 19 application across all platforms (Android, iOS, "
-                "Web, Desktop) while maintaining bidirectional communication through JavaScript bridges and "
-                "preserving your existing Angular codebase without modifications."
-            ]
-        )
+        try:
+            asyncio.run(self._run_with_browser())
+        finally:
+            _LOG_BUFFER.flush()
+    
+    async def _run_with_browser(self):
+        """Generate the documentation, always shutting the browser down afterwards"""
+        try:
+            await self._generate_full_documentation()
+        finally:
+            # Stop renders still in flight (after an error) before the browser goes away
+            pending = [task for task in self._rendered.values() if not task.done()]
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            await self._shutdown_browser()
+    
+    async def _generate_full_documentation(self):
+        """Build the story while diagrams render in the background"""
+        _LOG.info("\n📄 Generating PDF Documentation...")
+        _LOG.info("="*60)
         
-        # High-Level Diagram
-        print("[3/12] Adding architecture diagram...")
+        # Diagrams are independent of the text, so start rendering them all up front
         diagram1 = """
 graph TB
     subgraph "Flutter Application"
@@ -382,29 +748,7 @@ graph TB
     K --> B
     L --> B
 """
-        self.add_diagram(diagram1, "High-Level Architecture Overview", "arch_overview")
-        
-        # Implementation Steps
-        print("[4/12] Adding implementation steps...")
-        self.add_section(
-            "2. Implementation Steps",
-            [
-                "<b>Step 1: Create Flutter Plugin Package</b> - Use flutter create --template=plugin to create a multi-platform plugin package supporting Android, iOS, Web, Windows, macOS, and Linux.",
-                
-                "<b>Step 2: Define Platform-Agnostic Interface</b> - Create an abstract EWalletInterface class that defines methods like initialize(), initAuth(), openPaymentWindow(), logout(), and buildDashboard().",
-                
-                "<b>Step 3: Implement Conditional Platform Imports</b> - Use Dart's conditional imports (dart.library.io for mobile, dart.library.html for web) to automatically select correct implementation at compile time.",
-                
-                "<b>Step 4: Build Mobile Implementation</b> - Use flutter_inappwebview plugin to wrap native WebView components (WKWebView for iOS, AndroidWebView for Android) with JavaScript-to-Dart communication bridges.",
-                
-                "<b>Step 5: Build Web Implementation</b> - Use HtmlElementView with platformViewRegistry to embed HTML iframe elements, implementing communication via window.postMessage() API.",
-                
-                "<b>Step 6: Build Desktop Implementation</b> - Use InAppWebView with desktop support (WebView2 for Windows, WKWebView for macOS, WebKitGTK for Linux) for consistent cross-desktop experience."
-            ]
-        )
         
-        # Mobile Flow
-        print("[5/12] Adding mobile sequence diagram...")
         diagram2 = """
 sequenceDiagram
     participant App as Flutter App
@@ -438,10 +782,141 @@ sequenceDiagram
     Bridge->>SDK: Trigger Dart callback
     SDK-->>App: Return PaymentResponse
 """
-        self.add_diagram(diagram2, "Mobile Authentication and Payment Flow", "mobile_flow")
+        
+        diagram3 = """
+stateDiagram-v2
+    [*] --> Uninitialized
+    
+    Uninitialized --> Initializing: SDK.initialize()
+    Initializing --> Initialized: Platform detected
+    
+    Initialized --> Authenticating: initAuth()
+    Authenticating --> Authenticated: JWT validated<br/>Cookies set
+    
+    Authenticated --> DashboardLoading: buildDashboard()
+    DashboardLoading --> DashboardReady: Angular loaded<br/>Bridges established
+    
+    DashboardReady --> PaymentInitiated: openPaymentWindow()
+    PaymentInitiated --> PaymentProcessing: User enters info
+    
+    PaymentProcessing --> PaymentSuccess: Payment confirmed
+    PaymentProcessing --> PaymentError: Payment failed
+    
+    PaymentSuccess --> DashboardReady: Modal closed
+    PaymentError --> DashboardReady: Error handled
+    
+    DashboardReady --> LoggingOut: logout()
+    LoggingOut --> Initialized: Session cleared
+    
+    Initialized --> [*]: SDK disposed
+"""
+        
+        diagram4 = """
+graph TB
+    subgraph "Flutter Web App"
+        A[Flutter Widget Tree] --> B[EWallet SDK Web]
+    end
+    
+    subgraph "Platform View"
+        B --> C[platformViewRegistry]
+        C --> D[Create iframe Element]
+    end
+    
+    subgraph "Integration"
+        D --> E[HtmlElementView Widget]
+        E --> F[Render in Flutter Canvas]
+    end
+    
+    subgraph "Angular App"
+        F --> G[iframe loads Angular]
+        G --> H[Angular 19 Rendered]
+    end
+    
+    subgraph "Communication"
+        B <-->|postMessage| I[window.postMessage API]
+        I <-->|Origin validated| H
+    end
+"""
+        
+        diagram5 = """
+graph LR
+    A[SDK Development] --> B[flutter pub publish]
+    B --> C[pub.dev Registry]
+    C --> D[Consumer pubspec.yaml]
+    D --> E{Platform Build}
+    E -->|Android| F[APK with AAR]
+    E -->|iOS| G[IPA with Framework]
+    E -->|Web| H[JavaScript Bundle]
+    E -->|Desktop| I[Native Binary]
+    F --> J[User Device]
+    G --> J
+    H --> K[Browser]
+    I --> L[Desktop PC]
+    J --> M[Load Angular from Server]
+    K --> M
+    L --> M
+"""
+        
+        await self.prerender_all_diagrams([
+            (diagram1, "arch_overview"),
+            (diagram2, "mobile_flow"),
+            (diagram3, "states"),
+            (diagram4, "web_arch"),
+            (diagram5, "distribution"),
+        ])
+        
+        # Title Page
+        await self._step("\n[1/12] Adding title page...")
+        self.add_title_page()
+        
+        # Architecture Overview
+        await self._step("[2/12] Adding architecture overview...")
+        self.add_section(
+            "1. Architecture Overview",
+            [
+                "This architecture pattern is called the <b>Cross-Platform Hybrid SDK Architecture with "
+                "Platform-Specific Abstraction Layer</b> or <b>Multi-Platform WebView Bridge SDK Pattern</b>.",
+                
+                "It combines WebView embedding, JavaScript-to-Native bridges, and platform-specific "
+                "implementations under a unified Dart API interface. The SDK functions as a Flutter Plugin "
+                "Package that provides a single API interface while using different platform-specific "
+                "implementations underneath.",
+                
+                "Your eWallet SDK will embed your Angular 19 application across all platforms (Android, iOS, "
+                "Web, Desktop) while maintaining bidirectional communication through JavaScript bridges and "
+                "preserving your existing Angular codebase without modifications."
+            ]
+        )
+        
+        # High-Level Diagram
+        await self._step("[3/12] Adding architecture diagram...")
+        await self.add_diagram(diagram1, "High-Level Architecture Overview", "arch_overview")
+        
+        # Implementation Steps
+        await self._step("[4/12] Adding implementation steps...")
+        self.add_section(
+            "2. Implementation Steps",
+            [
+                "<b>Step 1: Create Flutter Plugin Package</b> - Use flutter create --template=plugin to create a multi-platform plugin package supporting Android, iOS, Web, Windows, macOS, and Linux.",
+                
+                "<b>Step 2: Define Platform-Agnostic Interface</b> - Create an abstract EWalletInterface class that defines methods like initialize(), initAuth(), openPaymentWindow(), logout(), and buildDashboard().",
+                
+                "<b>Step 3: Implement Conditional Platform Imports</b> - Use Dart's conditional imports (dart.library.io for mobile, dart.library.html for web) to automatically select correct implementation at compile time.",
+                
+                "<b>Step 4: Build Mobile Implementation</b> - Use flutter_inappwebview plugin to wrap native WebView components (WKWebView for iOS, AndroidWebView for Android) with JavaScript-to-Dart communication bridges.",
+                
+                "<b>Step 5: Build Web Implementation</b> - Use HtmlElementView with platformViewRegistry to embed HTML iframe elements, implementing communication via window.postMessage() API.",
+                
+                "<b>Step 6: Build Desktop Implementation</b> - Use InAppWebView with desktop support (WebView2 for Windows, WKWebView for macOS, WebKitGTK for Linux) for consistent cross-desktop experience."
+            ]
+        )
+        
+        # Mobile Flow
+        await self._step("[5/12] Adding mobile sequence diagram...")
+        await self.add_diagram(diagram2, "Mobile Authentication and Payment Flow", "mobile_flow")
         
         # Code Example
-        print("[6/12] Adding code examples...")
+        await self._step("[6/12] Adding code examples...")
         self.add_section("3. Platform-Agnostic Interface Code", "")
         self.add_code_block("""abstract class EWalletInterface {
   Future<void> initialize({
@@ -506,7 +981,7 @@ try {
 }""", "dart")
         
         # Platform Details
-        print("[7/12] Adding platform details...")
+        await self._step("[7/12] Adding platform details...")
         self.add_section(
             "5. Platform-Specific Implementation Details",
             [
@@ -525,38 +1000,11 @@ try {
         )
         
         # State Management
-        print("[8/12] Adding state management...")
-        diagram3 = """
-stateDiagram-v2
-    [*] --> Uninitialized
-    
-    Uninitialized --> Initializing: SDK.initialize()
-    Initializing --> Initialized: Platform detected
-    
-    Initialized --> Authenticating: initAuth()
-    Authenticating --> Authenticated: JWT validated<br/>Cookies set
-    
-    Authenticated --> DashboardLoading: buildDashboard()
-    DashboardLoading --> DashboardReady: Angular loaded<br/>Bridges established
-    
-    DashboardReady --> PaymentInitiated: openPaymentWindow()
-    PaymentInitiated --> PaymentProcessing: User enters info
-    
-    PaymentProcessing --> PaymentSuccess: Payment confirmed
-    PaymentProcessing --> PaymentError: Payment failed
-    
-    PaymentSuccess --> DashboardReady: Modal closed
-    PaymentError --> DashboardReady: Error handled
-    
-    DashboardReady --> LoggingOut: logout()
-    LoggingOut --> Initialized: Session cleared
-    
-    Initialized --> [*]: SDK disposed
-"""
-        self.add_diagram(diagram3, "SDK State Management Lifecycle", "states")
+        await self._step("[8/12] Adding state management...")
+        await self.add_diagram(diagram3, "SDK State Management Lifecycle", "states")
         
         # Communication Architecture
-        print("[9/12] Adding communication architecture...")
+        await self._step("[9/12] Adding communication architecture...")
         self.add_section(
             "6. Bidirectional Communication Architecture",
             [
@@ -569,56 +1017,12 @@ stateDiagram-v2
         )
         
         # Web Architecture
-        print("[10/12] Adding web architecture...")
-        diagram4 = """
-graph TB
-    subgraph "Flutter Web App"
-        A[Flutter Widget Tree] --> B[EWallet SDK Web]
-    end
-    
-    subgraph "Platform View"
-        B --> C[platformViewRegistry]
-        C --> D[Create iframe Element]
-    end
-    
-    subgraph "Integration"
-        D --> E[HtmlElementView Widget]
-        E --> F[Render in Flutter Canvas]
-    end
-    
-    subgraph "Angular App"
-        F --> G[iframe loads Angular]
-        G --> H[Angular 19 Rendered]
-    end
-    
-    subgraph "Communication"
-        B <-->|postMessage| I[window.postMessage API]
-        I <-->|Origin validated| H
-    end
-"""
-        self.add_diagram(diagram4, "Web Platform Architecture", "web_arch")
+        await self._step("[10/12] Adding web architecture...")
+        await self.add_diagram(diagram4, "Web Platform Architecture", "web_arch")
         
         # Distribution
-        print("[11/12] Adding distribution pipeline...")
-        diagram5 = """
-graph LR
-    A[SDK Development] --> B[flutter pub publish]
-    B --> C[pub.dev Registry]
-    C --> D[Consumer pubspec.yaml]
-    D --> E{Platform Build}
-    E -->|Android| F[APK with AAR]
-    E -->|iOS| G[IPA with Framework]
-    E -->|Web| H[JavaScript Bundle]
-    E -->|Desktop| I[Native Binary]
-    F --> J[User Device]
-    G --> J
-    H --> K[Browser]
-    I --> L[Desktop PC]
-    J --> M[Load Angular from Server]
-    K --> M
-    L --> M
-"""
-        self.add_diagram(diagram5, "SDK Distribution Pipeline", "distribution")
+        await self._step("[11/12] Adding distribution pipeline...")
+        await self.add_diagram(diagram5, "SDK Distribution Pipeline", "distribution")
         
         self.add_section(
             "7. Package Distribution Process",
@@ -636,7 +1040,7 @@ graph LR
         )
         
         # Security & Best Practices
-        print("[12/12] Adding security and conclusion...")
+        await self._step("[12/12] Adding security and conclusion...")
         self.add_section(
             "8. Security Considerations",
             [
@@ -683,32 +1087,49 @@ graph LR
         )
         
         # Build PDF
-        print("\n🔨 Building PDF...")
+        _LOG.info("\n🔨 Building PDF...")
         try:
+            # reportlab's many small writes and seeks go to memory; the file is
+            # written once afterwards. A fresh buffer per build, so repeat runs
+            # don't append to the previous PDF.
+            buf = BytesIO()
+            self.doc = SimpleDocTemplate(
+                buf,
+                pagesize=letter,
+                rightMargin=PAGE_MARGIN,
+                leftMargin=PAGE_MARGIN,
+                topMargin=PAGE_MARGIN,
+                bottomMargin=PAGE_MARGIN
+            )
             self.doc.build(self.story)
+            # getbuffer() exposes the bytes without copying them like getvalue()
+            with buf.getbuffer() as data, open(self.output_filename, 'wb') as f:
+                f.write(data)
+                pdf_bytes = data.nbytes
             
-            print("="*60)
-            print(f"\n✅ PDF Generated Successfully!")
-            print(f"📁 File: {self.output_filename}")
-            print(f"📊 Size: {os.path.getsize(self.output_filename) / 1024:.2f} KB")
-            print("="*60)
+            _LOG.info("="*60)
+            _LOG.info(f"\n✅ PDF Generated Successfully!")
+            _LOG.info(f"📁 File: {self.output_filename}")
+            _LOG.info(f"📊 Size: {pdf_bytes / 1024:.2f} KB")
+            _LOG.info("="*60)
         finally:
             # Clean up temp files after PDF is built
-            print("\n🧹 Cleaning up temporary files...")
+            _LOG.info("\n🧹 Cleaning up temporary files...")
             self.cleanup_temp_files()
-            print("✅ Cleanup complete")
+            _LOG.info("✅ Cleanup complete")
 
 def main():
     """Main function"""
-    print("\n" + "="*60)
-    print("  EWallet Flutter SDK Documentation Generator")
-    print("  Enhanced Edition with Playwright Support")
-    print("="*60)
-    
-    # Check if we should use playwright
-    use_playwright = PLAYWRIGHT_AVAILABLE
+    sys.stdout.write("\n".join([
+        "",
+        "="*60,
+        "  EWallet Flutter SDK Documentation Generator",
+        "  Enhanced Edition with Playwright Support",
+        "="*60,
+    ]) + "\n")
     
-    generator = EnhancedEWalletSDKDocGenerator(use_playwright=use_playwright)
+    # Playwright is resolved on first render, falling back to mermaid.ink
+    generator = EnhancedEWalletSDKDocGenerator()
     generator.generate_full_documentation()
     
     print("\n✨ Documentation generation complete!\n")